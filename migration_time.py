@@ -1,27 +1,306 @@
 import boto3
+import hashlib
+import heapq
+import json
 import os
+import sys
+import time
+from botocore.config import Config
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
-def write_output(file, text):
-    """Write to both console and file"""
-    try:
-        print(text)
-    except UnicodeEncodeError:
-        print(text.encode('utf-8', errors='replace').decode('utf-8', errors='replace'))
-    file.write(text + "\n")
+class OutputBuffer:
+    """Collect report lines and write them to the console and the file in batches"""
+    
+    def __init__(self, file):
+        self.file = file
+        self.lines = []
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.flush()
+    
+    def write(self, text):
+        """Queue a line for the console and the file"""
+        self.lines.append(text)
+    
+    def flush(self):
+        """Write all queued lines to the console and the file, one call each"""
+        if self.lines:
+            self.lines.append("")
+            text = "\n".join(self.lines)
+            sys.stdout.write(text)
+            sys.stdout.flush()
+            self.file.write(text)
+            self.lines.clear()
+
+# One migrating image; a tuple keeps per-image memory low on large accounts
+MigrationRow = namedtuple('MigrationRow', 'repo tag size last_pulled never_pulled')
+
+# Report rules and banner borders
+BANNER_EDGE = "+" + "=" * 78 + "+"
+BANNER_BLANK = "|" + " " * 78 + "|"
+SECTION_RULE = "  " + "-" * 40
+DASH_RULE = "-" * 80
+DOUBLE_RULE = "=" * 80
+
+# Closing lines of every repository block, written as one string
+REPO_FOOTER = "\n".join(["|", "+" + "-" * 79, ""])
+
+def banner(title):
+    """Build a boxed, centred title as a single multi-line string"""
+    return "\n".join([BANNER_EDGE, BANNER_BLANK, "|" + title.center(78) + "|", BANNER_BLANK, BANNER_EDGE])
+
+HEADER_BANNER = banner("ECR TO S3 MIGRATION TIME CALCULATOR")
+SUMMARY_BANNER = banner("MIGRATION SUMMARY")
+TOP_MIGRATIONS_BANNER = banner("TOP 10 LARGEST MIGRATIONS")
+
+# Where the repository list is cached between runs
+REPO_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ecr-migration-calculator")
+
+# Tag list used for images with no tags (missing or empty imageTags)
+_UNTAGGED = ('<untagged>',)
+
+# Byte-to-MB/GB scale factors (exact, since they are powers of two)
+_MB = 1.0 / (1024 * 1024)
+_GB = _MB / 1024
 
 def format_size(bytes_value):
     """Convert bytes to human-readable format"""
-    mb = bytes_value / (1024 * 1024)
-    gb = mb / 1024
-    if gb >= 1:
-        return f"{gb:.2f} GB"
+    mb = bytes_value * _MB
+    if mb >= 1024:
+        return f"{bytes_value * _GB:.2f} GB"
     return f"{mb:.2f} MB"
 
+# Number of repositories scanned at the same time
+SCAN_WORKERS = 16
+
+# Connection pool is sized above the worker count so threads don't queue;
+# adaptive retries back off client-side when ECR starts throttling
+ECR_CLIENT_CONFIG = Config(
+    max_pool_connections=SCAN_WORKERS * 2,
+    retries={'max_attempts': 10, 'mode': 'adaptive'},
+    tcp_keepalive=True
+)
+
+@lru_cache(maxsize=None)
+def get_ecr_client(aws_region):
+    """
+    Create the ECR client for a region once per process and reuse it.
+    Loading the boto3 service model is the expensive part of client creation.
+    """
+    return boto3.client(
+        'ecr',
+        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
+        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
+        region_name=aws_region,
+        config=ECR_CLIENT_CONFIG
+    )
+
+def iter_repositories(ecr_client):
+    """Yield every repository in the registry, 1000 per describe_repositories call"""
+    kwargs = {'maxResults': 1000}
+    while True:
+        response = ecr_client.describe_repositories(**kwargs)
+        yield from response['repositories']
+        next_token = response.get('nextToken')
+        if not next_token:
+            break
+        kwargs['nextToken'] = next_token
+
+def repository_cache_path(aws_region):
+    """Cache file for the repository list, keyed by region and access key"""
+    key_hash = hashlib.sha256(os.getenv('AWS_ACCESS_KEY_ID', '').encode('utf-8')).hexdigest()[:16]
+    return os.path.join(REPO_CACHE_DIR, f"repositories_{aws_region}_{key_hash}.json")
+
+def load_cached_repositories(cache_path, ttl):
+    """Return the cached repository list if it is younger than ttl seconds, otherwise None"""
+    try:
+        if time.time() - os.path.getmtime(cache_path) >= ttl:
+            return None
+        with open(cache_path, encoding='utf-8') as cache_file:
+            cached = json.load(cache_file)
+        return [
+            {'repositoryName': r['repositoryName'], 'createdAt': datetime.fromisoformat(r['createdAt'])}
+            for r in cached
+        ]
+    except (OSError, ValueError, KeyError, TypeError):
+        # Missing, unreadable or corrupt cache: fetch from ECR instead
+        return None
+
+def iter_repositories_and_cache(ecr_client, cache_path):
+    """Yield every repository from ECR, then save the complete list to cache_path"""
+    cached = []
+    for repository in iter_repositories(ecr_client):
+        cached.append({
+            'repositoryName': repository['repositoryName'],
+            'createdAt': repository['createdAt'].isoformat()
+        })
+        yield repository
+    
+    # The cache only saves API calls on the next run, so failing to write it
+    # must not fail this one
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        temp_path = cache_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as cache_file:
+            json.dump(cached, cache_file)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        pass
+
+def iter_image_details(ecr_client, repo_name):
+    """Yield every image in a repository, 1000 per describe_images call"""
+    kwargs = {'repositoryName': repo_name, 'maxResults': 1000}
+    while True:
+        response = ecr_client.describe_images(**kwargs)
+        yield from response['imageDetails']
+        next_token = response.get('nextToken')
+        if not next_token:
+            break
+        kwargs['nextToken'] = next_token
+
+def process_repository(ecr_client, repository, start_date, end_date):
+    """
+    Scan a single repository and collect the images that qualify for migration.
+    Returns a result dict, including the repository's finished report block as
+    one string, instead of writing output, so repositories can be scanned
+    concurrently and reported in order afterwards.
+    """
+    repo_name = repository['repositoryName']
+    result = {
+        'repo': repo_name,
+        'scanned': 0,
+        'migrate_count': 0,
+        'migrate_size': 0,
+        'rows': [],
+        'skipped': False,
+        'error': None,
+        'text': ""
+    }
+    
+    # Every image is pushed after its repository was created, so a repository
+    # created after END_DATE cannot hold an image in range; skip it before
+    # making any image call
+    if repository['createdAt'] > end_date:
+        result['skipped'] = True
+        return result
+    
+    # Compare epoch seconds: one utcoffset() lookup per image instead of two
+    start_ts = start_date.timestamp()
+    end_ts = end_date.timestamp()
+    
+    # Accumulate in locals; they are written to the result once at the end
+    scanned = 0
+    migrate_size = 0
+    rows = []
+    image_lines = []
+    
+    try:
+        # Evaluate each image as it arrives from ECR. Only the date check runs
+        # for every image; the rest is done for images that qualify
+        for image in iter_image_details(ecr_client, repo_name):
+            scanned += 1
+            last_pulled = image.get('lastRecordedPullTime')
+            
+            # Use last pulled time, or fall back to push date if never pulled
+            effective_pull_date = last_pulled if last_pulled else image['imagePushedAt']
+            
+            # Check if effective pull date is in range
+            if start_ts <= effective_pull_date.timestamp() <= end_ts:
+                # MIGRATE - last pulled/created in date range
+                image_size = image['imageSizeInBytes']
+                tag_name = (image.get('imageTags') or _UNTAGGED)[0]
+                migrate_size += image_size
+                
+                # The date is only formatted for images that qualify
+                rows.append(MigrationRow(
+                    repo_name,
+                    tag_name,
+                    image_size,
+                    effective_pull_date.date().isoformat(),
+                    not last_pulled
+                ))
+                
+                pull_status = "Created" if not last_pulled else "Last pulled"
+                image_lines.append(f"|  >> MIGRATE >> {tag_name:<30} {format_size(image_size):>10}  {pull_status}: {rows[-1].last_pulled}")
+        
+        result['scanned'] = scanned
+        result['migrate_count'] = len(rows)
+        result['migrate_size'] = migrate_size
+        result['rows'] = rows
+    
+    except Exception as e:
+        result['error'] = e
+    
+    # Build the repository's report block
+    lines = ["+-- REPOSITORY: " + repo_name, "|"]
+    if result['error']:
+        lines.append(f"|  [ERROR] Failed to process repository: {result['error']}")
+    elif scanned == 0:
+        lines.append("|  [INFO] No images found in this repository")
+    else:
+        lines.append("|  Total images in repository: " + str(scanned))
+        lines.append("|")
+        lines.extend(image_lines)
+        lines.append("|")
+        if rows:
+            lines.append(f"|  Repository Summary: {len(rows)} to migrate ({format_size(migrate_size)})")
+        else:
+            lines.append("|  Repository Summary: No images qualify for migration")
+    lines.append(REPO_FOOTER)
+    result['text'] = "\n".join(lines)
+    
+    return result
+
+class JsonReport:
+    """
+    Stream every migrating image into a JSON report as each repository is
+    written, so the full list is never held in memory. The file is written
+    under a temporary name and only moved into place once finish() is called.
+    """
+    
+    def __init__(self, filename):
+        self.filename = filename
+        self.temp_filename = filename + ".tmp"
+        self.file = None
+        self.separator = ""
+        self.finished = False
+    
+    def __enter__(self):
+        self.file = open(self.temp_filename, 'w', encoding='utf-8', buffering=1 << 16)
+        self.file.write('{"migrations": [')
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.file.close()
+        if self.finished:
+            os.replace(self.temp_filename, self.filename)
+        else:
+            os.remove(self.temp_filename)
+    
+    def add_rows(self, rows):
+        """Append migration rows to the report"""
+        for row in rows:
+            self.file.write(self.separator + json.dumps(row._asdict()))
+            self.separator = ", "
+    
+    def finish(self, summary):
+        """Close the migrations list and add the summary fields"""
+        self.file.write("]")
+        for key, value in summary.items():
+            self.file.write(f", {json.dumps(key)}: {json.dumps(value)}")
+        self.file.write("}")
+        self.finished = True
+
 def calculate_migration_time():
     """
     Calculate migration time for ECR images where:
@@ -35,6 +314,8 @@ def calculate_migration_time():
     aws_secret_key = os.getenv('AWS_SECRET_ACCESS_KEY')
     aws_region = os.getenv('AWS_REGION', 'us-east-1')
     repository_name = os.getenv('ECR_REPOSITORY_NAME')
+    repository_prefix = os.getenv('ECR_REPO_PREFIX')
+    repo_cache_ttl_str = os.getenv('ECR_REPO_CACHE_TTL') or '0'  # Seconds, 0 disables
     
     # Get date range from .env
     start_date_str = os.getenv('START_DATE')  # Format: YYYY-MM-DD
@@ -49,238 +330,226 @@ def calculate_migration_time():
         print("Error: Missing START_DATE or END_DATE in .env file")
         return
     
+    try:
+        repo_cache_ttl = int(repo_cache_ttl_str)
+    except ValueError:
+        print(f"Error: ECR_REPO_CACHE_TTL must be a whole number of seconds, got '{repo_cache_ttl_str}'")
+        return
+    
     # Convert dates to datetime objects
     try:
         start_date = datetime.strptime(start_date_str, '%Y-%m-%d')
         end_date = datetime.strptime(end_date_str, '%Y-%m-%d')
         # Set end_date to end of day for inclusive comparison
         end_date = end_date.replace(hour=23, minute=59, second=59)
+        # Make both bounds timezone-aware (local time) so they compare directly
+        # against the timezone-aware timestamps returned by ECR
+        start_date = start_date.astimezone()
+        end_date = end_date.astimezone()
     except (ValueError, TypeError) as e:
         print(f"Error: Invalid date format. Use YYYY-MM-DD. Error: {e}")
         return
     
-    # Create output filename with timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    # Create output filename with timestamp; the same time is shown in the report
+    report_time = datetime.now()
+    timestamp = report_time.strftime("%Y%m%d_%H%M%S")
     output_filename = f"ecr_migration_report_{timestamp}.txt"
+    json_filename = f"ecr_migration_report_{timestamp}.json"
+    
+    # Get the (cached) ECR client
+    ecr_client = get_ecr_client(aws_region)
     
     # Open output file
-    with open(output_filename, 'w', encoding='utf-8') as output_file:
-        
-        # Create ECR client
-        ecr_client = boto3.client(
-            'ecr',
-            aws_access_key_id=aws_access_key,
-            aws_secret_access_key=aws_secret_key,
-            region_name=aws_region
-        )
+    with open(output_filename, 'w', encoding='utf-8', buffering=1 << 16) as output_file, \
+            OutputBuffer(output_file) as output, \
+            JsonReport(json_filename) as json_report:
         
         # Write header
-        write_output(output_file, "")
-        write_output(output_file, "+" + "=" * 78 + "+")
-        write_output(output_file, "|" + " " * 78 + "|")
-        write_output(output_file, "|" + "ECR TO S3 MIGRATION TIME CALCULATOR".center(78) + "|")
-        write_output(output_file, "|" + " " * 78 + "|")
-        write_output(output_file, "+" + "=" * 78 + "+")
-        write_output(output_file, "")
-        write_output(output_file, "  Report Generated : " + datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-        write_output(output_file, "  AWS Region       : " + aws_region)
+        output.write("")
+        output.write(HEADER_BANNER)
+        output.write("")
+        output.write("  Report Generated : " + report_time.strftime('%Y-%m-%d %H:%M:%S'))
+        output.write("  AWS Region       : " + aws_region)
         if repository_name:
-            write_output(output_file, "  Target Scope     : Single Repository '" + repository_name + "'")
+            output.write("  Target Scope     : Single Repository '" + repository_name + "'")
+        elif repository_prefix:
+            output.write("  Target Scope     : Repositories starting with '" + repository_prefix + "'")
         else:
-            write_output(output_file, "  Target Scope     : All Repositories")
-        write_output(output_file, "")
-        write_output(output_file, "  MIGRATION CRITERIA")
-        write_output(output_file, "  " + "-" * 40)
-        write_output(output_file, "  Last Pulled Between : " + start_date_str + " to " + end_date_str)
-        write_output(output_file, "  (Images last pulled/created within this date range will be migrated)")
-        write_output(output_file, "")
-        write_output(output_file, "-" * 80)
-        write_output(output_file, "")
+            output.write("  Target Scope     : All Repositories")
+        output.write("")
+        output.write("  MIGRATION CRITERIA")
+        output.write(SECTION_RULE)
+        output.write("  Last Pulled Between : " + start_date_str + " to " + end_date_str)
+        output.write("  (Images last pulled/created within this date range will be migrated)")
+        output.write("")
+        output.write(DASH_RULE)
+        output.write("")
+        output.flush()
         
         total_size_bytes = 0
         total_images_to_migrate = 0
         total_images_scanned = 0
         repositories_processed = 0
         repositories_with_migrations = 0
+        repositories_skipped = 0
         
-        migration_details = []
+        # Min-heap of the 10 largest migrations seen so far, as
+        # (size, -arrival order, row); earlier rows win ties
+        top_migrations = []
+        rows_seen = 0
         
         try:
             # Get repositories to scan
-            repositories_to_scan = []
-            
             if repository_name:
                 try:
                     response = ecr_client.describe_repositories(repositoryNames=[repository_name])
                     repositories_to_scan = response['repositories']
                 except ecr_client.exceptions.RepositoryNotFoundException:
                     error_msg = f"ERROR: Repository '{repository_name}' not found"
-                    write_output(output_file, error_msg)
+                    output.write(error_msg)
                     return
             else:
-                repo_paginator = ecr_client.get_paginator('describe_repositories')
-                repo_pages = repo_paginator.paginate()
-                
-                for repo_page in repo_pages:
-                    repositories_to_scan.extend(repo_page['repositories'])
-            
-            # Process each repository
-            for repository in repositories_to_scan:
-                repo_name = repository['repositoryName']
-                repositories_processed += 1
+                cache_path = repository_cache_path(aws_region)
+                cached_repositories = None
+                if repo_cache_ttl > 0:
+                    cached_repositories = load_cached_repositories(cache_path, repo_cache_ttl)
                 
-                repo_migrate_count = 0
-                repo_migrate_size = 0
+                if cached_repositories is not None:
+                    output.write(f"  [INFO] Using repository list cached within the last {repo_cache_ttl} seconds")
+                    output.write("")
+                    repositories_to_scan = cached_repositories
+                elif repo_cache_ttl > 0:
+                    # Stream repositories page by page, so scanning starts as
+                    # soon as the first page arrives
+                    repositories_to_scan = iter_repositories_and_cache(ecr_client, cache_path)
+                else:
+                    repositories_to_scan = iter_repositories(ecr_client)
                 
-                write_output(output_file, "+-- REPOSITORY: " + repo_name)
-                write_output(output_file, "|")
+                if repository_prefix:
+                    repositories_to_scan = (
+                        r for r in repositories_to_scan
+                        if r['repositoryName'].startswith(repository_prefix)
+                    )
+            
+            # Scan repositories concurrently; each worker only talks to ECR
+            with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+                results = executor.map(
+                    lambda repository: process_repository(ecr_client, repository, start_date, end_date),
+                    repositories_to_scan
+                )
                 
-                try:
-                    # Get all images from this repository
-                    image_paginator = ecr_client.get_paginator('describe_images')
-                    image_pages = image_paginator.paginate(repositoryName=repo_name)
-                    
-                    repo_images = []
-                    for image_page in image_pages:
-                        repo_images.extend(image_page['imageDetails'])
-                    
-                    if len(repo_images) == 0:
-                        write_output(output_file, "|  [INFO] No images found in this repository")
-                        write_output(output_file, "|")
-                        write_output(output_file, "+" + "-" * 79)
-                        write_output(output_file, "")
+                # Write results serially, in repository order
+                for result in results:
+                    if result['skipped']:
+                        repositories_skipped += 1
                         continue
                     
-                    total_images_scanned += len(repo_images)
-                    write_output(output_file, "|  Total images in repository: " + str(len(repo_images)))
-                    write_output(output_file, "|")
+                    repositories_processed += 1
                     
-                    # Evaluate each image
-                    for image in repo_images:
-                        image_size = image['imageSizeInBytes']
-                        tags = image.get('imageTags', ['<untagged>'])
-                        tag_name = tags[0] if tags else '<untagged>'
-                        push_date = image['imagePushedAt']
-                        last_pulled = image.get('lastRecordedPullTime')
-                        
-                        push_str = push_date.strftime('%Y-%m-%d')
-                        size_str = format_size(image_size)
+                    if not result['error']:
+                        total_images_scanned += result['scanned']
+                        total_images_to_migrate += result['migrate_count']
+                        total_size_bytes += result['migrate_size']
+                        json_report.add_rows(result['rows'])
                         
-                        # Use last pulled time, or fall back to push date if never pulled
-                        effective_pull_date = last_pulled if last_pulled else push_date
-                        effective_pull_date = effective_pull_date.replace(tzinfo=None)
-                        
-                        # Check if effective pull date is in range
-                        if start_date <= effective_pull_date <= end_date:
-                            # MIGRATE - last pulled/created in date range
-                            repo_migrate_count += 1
-                            repo_migrate_size += image_size
-                            total_images_to_migrate += 1
-                            total_size_bytes += image_size
-                            
-                            pulled_str = effective_pull_date.strftime('%Y-%m-%d')
-                            
-                            # Indicate if this was never actually pulled
-                            pull_status = "Created" if not last_pulled else "Last pulled"
-                            
-                            write_output(output_file, f"|  >> MIGRATE >> {tag_name:<30} {size_str:>10}  {pull_status}: {pulled_str}")
-                            
-                            migration_details.append({
-                                'repo': repo_name,
-                                'tag': tag_name,
-                                'size': image_size,
-                                'last_pulled': pulled_str,
-                                'push_date': push_str,
-                                'never_pulled': not last_pulled
-                            })
-                    
-                    # Repository summary
-                    write_output(output_file, "|")
-                    if repo_migrate_count > 0:
-                        repositories_with_migrations += 1
-                        write_output(output_file, f"|  Repository Summary: {repo_migrate_count} to migrate ({format_size(repo_migrate_size)})")
-                    else:
-                        write_output(output_file, "|  Repository Summary: No images qualify for migration")
+                        for row in result['rows']:
+                            entry = (row.size, -rows_seen, row)
+                            rows_seen += 1
+                            if len(top_migrations) < 10:
+                                heapq.heappush(top_migrations, entry)
+                            elif entry > top_migrations[0]:
+                                heapq.heapreplace(top_migrations, entry)
+                        if result['migrate_count'] > 0:
+                            repositories_with_migrations += 1
                     
-                except Exception as e:
-                    write_output(output_file, f"|  [ERROR] Failed to process repository: {e}")
-                
-                write_output(output_file, "|")
-                write_output(output_file, "+" + "-" * 79)
-                write_output(output_file, "")
+                    # The block was formatted by the worker; write it in one go
+                    output.write(result['text'])
+                    output.flush()
             
             # Calculate migration time at 1.33 MB/s
             speed_mb_per_sec = 1.33
-            total_size_mb = total_size_bytes / (1024 * 1024)
+            total_size_mb = total_size_bytes * _MB
             time_seconds = total_size_mb / speed_mb_per_sec if total_size_mb > 0 else 0
             time_minutes = time_seconds / 60
             time_hours = time_minutes / 60
             time_days = time_hours / 24
             
             # Final Summary
-            write_output(output_file, "")
-            write_output(output_file, "+" + "=" * 78 + "+")
-            write_output(output_file, "|" + " " * 78 + "|")
-            write_output(output_file, "|" + "MIGRATION SUMMARY".center(78) + "|")
-            write_output(output_file, "|" + " " * 78 + "|")
-            write_output(output_file, "+" + "=" * 78 + "+")
-            write_output(output_file, "")
-            write_output(output_file, "  Repositories")
-            write_output(output_file, "  " + "-" * 40)
-            write_output(output_file, f"    Total analyzed               : {repositories_processed}")
-            write_output(output_file, f"    With migration candidates    : {repositories_with_migrations}")
-            write_output(output_file, "")
-            write_output(output_file, "  Images Analysis")
-            write_output(output_file, "  " + "-" * 40)
-            write_output(output_file, f"    Total scanned                : {total_images_scanned}")
-            write_output(output_file, f"    Images to MIGRATE            : {total_images_to_migrate}")
-            write_output(output_file, f"    Migration percentage         : {(total_images_to_migrate/total_images_scanned*100) if total_images_scanned > 0 else 0:.1f}%")
-            write_output(output_file, "")
-            write_output(output_file, "  Migration Size")
-            write_output(output_file, "  " + "-" * 40)
-            write_output(output_file, f"    Total data to migrate        : {format_size(total_size_bytes)}")
-            write_output(output_file, "")
+            output.write("")
+            output.write(SUMMARY_BANNER)
+            output.write("")
+            output.write("  Repositories")
+            output.write(SECTION_RULE)
+            output.write(f"    Total analyzed               : {repositories_processed}")
+            output.write(f"    With migration candidates    : {repositories_with_migrations}")
+            if repositories_skipped > 0:
+                output.write(f"    Created after END_DATE       : {repositories_skipped}")
+            output.write("")
+            output.write("  Images Analysis")
+            output.write(SECTION_RULE)
+            output.write(f"    Total scanned                : {total_images_scanned}")
+            output.write(f"    Images to MIGRATE            : {total_images_to_migrate}")
+            output.write(f"    Migration percentage         : {(total_images_to_migrate/total_images_scanned*100) if total_images_scanned > 0 else 0:.1f}%")
+            output.write("")
+            output.write("  Migration Size")
+            output.write(SECTION_RULE)
+            output.write(f"    Total data to migrate        : {format_size(total_size_bytes)}")
+            output.write("")
             
             if total_images_to_migrate > 0:
-                write_output(output_file, "  ESTIMATED MIGRATION TIME (at 1.33 MB/s)")
-                write_output(output_file, "  " + "-" * 40)
-                write_output(output_file, f"    {time_seconds:,.0f} seconds")
-                write_output(output_file, f"    {time_minutes:,.1f} minutes")
-                write_output(output_file, f"    {time_hours:,.2f} hours")
+                output.write("  ESTIMATED MIGRATION TIME (at 1.33 MB/s)")
+                output.write(SECTION_RULE)
+                output.write(f"    {time_seconds:,.0f} seconds")
+                output.write(f"    {time_minutes:,.1f} minutes")
+                output.write(f"    {time_hours:,.2f} hours")
                 if time_hours >= 24:
-                    write_output(output_file, f"    {time_days:,.2f} days")
-                write_output(output_file, "")
+                    output.write(f"    {time_days:,.2f} days")
+                output.write("")
             else:
-                write_output(output_file, "  [RESULT] No images found with pull/creation dates in the specified range")
-                write_output(output_file, "")
+                output.write("  [RESULT] No images found with pull/creation dates in the specified range")
+                output.write("")
             
             # Top 10 largest migrations
-            if len(migration_details) > 0:
-                write_output(output_file, "")
-                write_output(output_file, "+" + "=" * 78 + "+")
-                write_output(output_file, "|" + " " * 78 + "|")
-                write_output(output_file, "|" + "TOP 10 LARGEST MIGRATIONS".center(78) + "|")
-                write_output(output_file, "|" + " " * 78 + "|")
-                write_output(output_file, "+" + "=" * 78 + "+")
-                write_output(output_file, "")
+            if top_migrations:
+                output.write("")
+                output.write(TOP_MIGRATIONS_BANNER)
+                output.write("")
                 
-                sorted_migrations = sorted(migration_details, key=lambda x: x['size'], reverse=True)[:10]
+                sorted_migrations = [entry[2] for entry in sorted(top_migrations, reverse=True)]
                 
                 for idx, img in enumerate(sorted_migrations, 1):
-                    never_pulled_tag = " [Never Pulled]" if img['never_pulled'] else ""
-                    write_output(output_file, f"  {idx:2d}. {img['repo']}/{img['tag']}{never_pulled_tag}")
-                    write_output(output_file, f"      Size: {format_size(img['size'])}  |  Date: {img['last_pulled']}")
-                    write_output(output_file, "")
+                    never_pulled_tag = " [Never Pulled]" if img.never_pulled else ""
+                    output.write(f"  {idx:2d}. {img.repo}/{img.tag}{never_pulled_tag}")
+                    output.write(f"      Size: {format_size(img.size)}  |  Date: {img.last_pulled}")
+                    output.write("")
+            
+            # Machine-readable copy of the results, alongside the text report
+            json_report.finish({
+                'region': aws_region,
+                'start_date': start_date_str,
+                'end_date': end_date_str,
+                'repositories_analyzed': repositories_processed,
+                'repositories_with_migrations': repositories_with_migrations,
+                'repositories_skipped': repositories_skipped,
+                'images_scanned': total_images_scanned,
+                'images_to_migrate': total_images_to_migrate,
+                'total_size_bytes': total_size_bytes,
+                'estimated_seconds': round(time_seconds)
+            })
             
-            write_output(output_file, "")
-            write_output(output_file, "=" * 80)
-            write_output(output_file, "  Report saved to: " + output_filename)
-            write_output(output_file, "=" * 80)
+            output.write("")
+            output.write(DOUBLE_RULE)
+            output.write("  Report saved to: " + output_filename)
+            output.write("  JSON saved to  : " + json_filename)
+            output.write(DOUBLE_RULE)
+            output.flush()
             print(f"\n*** Report successfully saved to: {output_filename} ***")
             
         except Exception as e:
             error_msg = f"ERROR: Failed to access ECR: {e}"
-            write_output(output_file, error_msg)
+            output.write(error_msg)
 
 if __name__ == "__main__":
+    # Print UTF-8 with replacement once, rather than catching encode errors per line
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
     calculate_migration_time()
\ No newline at end of file